@@ -16,6 +16,13 @@ function warnOnce(key: string, msg: string, ttlMs: number = 30_000): void {
   try { console.warn(chalk.yellow(MODULE_NAME), msg); } catch {}
 }
 
+// Diagnostic lines are off unless MEMU_PLUGIN_LOG=debug (read once at load).
+const DEBUG_LOG = String(process.env.MEMU_PLUGIN_LOG || '').trim().toLowerCase() === 'debug';
+function debugLog(...args: any[]): void {
+  if (!DEBUG_LOG) return;
+  try { console.log(chalk.gray(MODULE_NAME), ...args); } catch {}
+}
+
 type MemuStep =
   | 'preprocess'
   | 'memory_extract'
@@ -24,6 +31,15 @@ type MemuStep =
   | 'ranking'
   | 'embeddings';
 
+const MEMU_STEPS: readonly MemuStep[] = [
+  'preprocess',
+  'memory_extract',
+  'category_update',
+  'reflection',
+  'ranking',
+  'embeddings',
+];
+
 interface MemuPluginConfig {
   version: number;
   // In local mode, "default" means: the currently selected SillyTavern connection profile.
@@ -137,19 +153,11 @@ function sanitizeIncomingConfig(obj: any): MemuPluginConfig {
       : "default";
 
   const out: Partial<Record<MemuStep, string>> = {};
-  const allowed: MemuStep[] = [
-    "preprocess",
-    "memory_extract",
-    "category_update",
-    "reflection",
-    "ranking",
-    "embeddings",
-  ];
   const incoming =
     cfg.stepProfileId && typeof cfg.stepProfileId === "object"
       ? (cfg.stepProfileId as any)
       : {};
-  for (const k of allowed) {
+  for (const k of MEMU_STEPS) {
     const v = incoming[k];
     if (typeof v === "string" && v.trim()) out[k] = v.trim();
   }
@@ -211,7 +219,27 @@ export function setPluginConfig(obj: any): MemuPluginConfig {
 
 type AnyObject = Record<string, any>;
 
-let _profilesCache: { at: number; profiles: AnyObject[] } | null = null;
+// ST providers treated as OpenAI-compatible (base_url + api_key) in local mode.
+const OPENAI_COMPAT_PROVIDERS: ReadonlySet<string> = new Set([
+  'openai',
+  'openai-compatible',
+  'openai_compatible',
+  'openrouter',
+  'nanogpt',
+  'groq',
+  'together',
+  'togetherai',
+  'mistral',
+  'deepseek',
+  'xai',
+  'perplexity',
+  'custom',
+  'vllm',
+  'lmstudio',
+  'ollama',
+]);
+
+let _profilesCache: { at: number; profiles: AnyObject[]; dirs: string[]; sources: any[] } | null = null;
 const PROFILES_CACHE_TTL_MS = 2000;
 
 function listSTUserDirs(): string[] {
@@ -284,10 +312,24 @@ function loadAllProfilesFromSettings(): AnyObject[] {
   const now = Date.now();
   if (_profilesCache && (now - _profilesCache.at) < PROFILES_CACHE_TTL_MS) return _profilesCache.profiles;
 
-  const out: AnyObject[] = [];
   const userDirs = listSTUserDirs();
-  for (const dir of userDirs) {
-    const settings = readJsonCached(path.join(dir, "settings.json"));
+  const sources = userDirs.map((dir) => readJsonCached(path.join(dir, "settings.json")));
+
+  // readJsonCached keeps the parsed object identity until the file changes, so the
+  // same dirs + same settings objects means the profile list is unchanged.
+  if (
+    _profilesCache &&
+    _profilesCache.dirs.length === userDirs.length &&
+    _profilesCache.dirs.every((d, i) => d === userDirs[i] && _profilesCache!.sources[i] === sources[i])
+  ) {
+    _profilesCache.at = now;
+    return _profilesCache.profiles;
+  }
+
+  const out: AnyObject[] = [];
+  for (let i = 0; i < userDirs.length; i++) {
+    const dir = userDirs[i];
+    const settings = sources[i];
     if (!settings) continue;
 
     // Fast path: ST stores connection profiles here in 1.15+
@@ -319,7 +361,7 @@ function loadAllProfilesFromSettings(): AnyObject[] {
     seen.add(id);
     return true;
   });
-  _profilesCache = { at: Date.now(), profiles };
+  _profilesCache = { at: Date.now(), profiles, dirs: userDirs, sources };
   return profiles;
 }
 
@@ -396,7 +438,7 @@ function findSelectedProfileIdForUserDir(userDir: string, profiles: AnyObject[])
   }
 }
 
-function normalizeProfile(p: AnyObject): {
+type NormalizedProfile = {
   id: string;
   name: string;
   provider: string;
@@ -404,7 +446,22 @@ function normalizeProfile(p: AnyObject): {
   model: string | null;
   secretId?: string | null;
   tokenInline?: string | null;
-} {
+};
+
+// Profile objects keep their identity until settings.json changes (readJsonCached),
+// so the field-alias probing below runs once per profile object, not once per call.
+const _normalizedProfiles = new WeakMap<AnyObject, NormalizedProfile>();
+
+function normalizeProfile(p: AnyObject): NormalizedProfile {
+  let n = _normalizedProfiles.get(p);
+  if (!n) {
+    n = _normalizeProfileUncached(p);
+    _normalizedProfiles.set(p, n);
+  }
+  return n;
+}
+
+function _normalizeProfileUncached(p: AnyObject): NormalizedProfile {
   const id = String(p.id);
   const name = String(p.name);
   const provider =
@@ -491,6 +548,24 @@ function _extractKeyValue(entry: any, wantedId?: string | null, strictId: boolea
 }
 
 
+// secrets.json key names per provider (best-effort; ST key names can vary by version).
+const PROVIDER_SECRET_KEYS: Record<string, string[]> = {
+  openai: ["api_key_openai"],
+  openrouter: ["api_key_openrouter"],
+  custom: ["api_key_custom"],
+  groq: ["api_key_groq"],
+  mistral: ["api_key_mistral"],
+  anthropic: ["api_key_anthropic"],
+  google: ["api_key_google", "api_key_gemini"],
+  deepseek: ["api_key_deepseek"],
+  cohere: ["api_key_cohere"],
+  together: ["api_key_together", "api_key_togetherai"],
+  xai: ["api_key_xai", "api_key_grok"],
+  grok: ["api_key_grok", "api_key_xai"],
+  nanogpt: ["api_key_nanogpt"],
+  horde: ["api_key_horde"],
+};
+
 function pickKeyForProvider(provider: string, secrets: AnyObject | null, secretId?: string | null): string | null {
   if (!secrets || typeof secrets !== "object") return null;
 
@@ -502,25 +577,8 @@ function pickKeyForProvider(provider: string, secrets: AnyObject | null, secretI
     }
   }
 
-  // Direct mapping for common providers (best-effort; ST key names can vary by version).
-  const mapping: Record<string, string[]> = {
-    openai: ["api_key_openai"],
-    openrouter: ["api_key_openrouter"],
-    custom: ["api_key_custom"],
-    groq: ["api_key_groq"],
-    mistral: ["api_key_mistral"],
-    anthropic: ["api_key_anthropic"],
-    google: ["api_key_google", "api_key_gemini"],
-    deepseek: ["api_key_deepseek"],
-    cohere: ["api_key_cohere"],
-    together: ["api_key_together", "api_key_togetherai"],
-    xai: ["api_key_xai", "api_key_grok"],
-    grok: ["api_key_grok", "api_key_xai"],
-    nanogpt: ["api_key_nanogpt"],
-    horde: ["api_key_horde"],
-  };
-
-  const keys = mapping[provider] || mapping[provider.replace(/[^a-z0-9_]/g, "")] || [];
+  // Direct mapping for common providers.
+  const keys = PROVIDER_SECRET_KEYS[provider] || PROVIDER_SECRET_KEYS[provider.replace(/[^a-z0-9_]/g, "")] || [];
   for (const k of keys) {
     const v = _extractKeyValue((secrets as any)[k], secretId);
     if (v) return v;
@@ -578,10 +636,6 @@ export function getConnectionProfilesSummary(): {
     if (sid) selectedByUserDir.add(String(sid));
   }
   const selectedProfileId = selectedByUserDir.size ? Array.from(selectedByUserDir)[0] : null;
-  const openaiLike = new Set([
-    'openai', 'openai-compatible', 'openai_compatible', 'openrouter', 'nanogpt', 'groq', 'together', 'togetherai',
-    'mistral', 'deepseek', 'xai', 'perplexity', 'custom', 'vllm', 'lmstudio', 'ollama',
-  ]);
 
   for (const p of profiles) {
     try {
@@ -591,7 +645,7 @@ export function getConnectionProfilesSummary(): {
       const hasSignal = Boolean((n.baseUrl && n.baseUrl.trim()) || (n.model && n.model.trim()) || (key && String(key).trim()));
       if (!hasSignal) continue;
       const chatCapable = Boolean((n.baseUrl && n.baseUrl.trim()) && (n.model && n.model.trim()) && (key && String(key).trim()));
-      const embListCapable = Boolean((n.baseUrl && n.baseUrl.trim()) && (key && String(key).trim()) && (openaiLike.has(String(n.provider || '').toLowerCase()) || /nano-gpt\.com/i.test(String(n.baseUrl || ''))));
+      const embListCapable = Boolean((n.baseUrl && n.baseUrl.trim()) && (key && String(key).trim()) && (OPENAI_COMPAT_PROVIDERS.has(String(n.provider || '').toLowerCase()) || /nano-gpt\.com/i.test(String(n.baseUrl || ''))));
 
       const id = String((p as any).id || '').trim();
       let name = String((p as any).name || (p as any).label || (p as any).title || '').trim();
@@ -672,9 +726,12 @@ function httpGetJson(url: string, headers: Record<string, string>, timeoutMs: nu
           headers,
         },
         (res: any) => {
-          let buf = '';
-          res.on('data', (d: any) => (buf += d.toString('utf8')));
+          // Keep raw chunks and decode once: avoids per-chunk string building and
+          // never splits a multi-byte UTF-8 sequence across chunk boundaries.
+          const chunks: Buffer[] = [];
+          res.on('data', (d: Buffer) => chunks.push(d));
           res.on('end', () => {
+            const buf = Buffer.concat(chunks).toString('utf8');
             const code = res.statusCode || 0;
             if (code < 200 || code >= 300) {
               return reject(new Error(`HTTP ${code} from ${url}`));
@@ -702,29 +759,46 @@ type ModelsKind = 'embedding' | 'chat' | 'all';
 
 const MODEL_CACHE_TTL_MS = 5 * 60 * 1000;
 const MODEL_CACHE: Map<string, { ts: number; value: { ok: boolean; models: string[]; message?: string } }> = new Map();
+// kind|profileId -> MODEL_CACHE key, refreshed whenever the profile is resolved.
+const MODEL_CACHE_ALIAS: Map<string, string> = new Map();
 
 export async function listModelsForProfile(
   profileId: string,
   opts?: { kind?: ModelsKind; force?: boolean }
 ): Promise<{ ok: boolean; models: string[]; message?: string }> {
   const kind: ModelsKind = (opts?.kind || 'all') as ModelsKind;
-  const cacheKey = `${kind}|${profileId}`;
+  const aliasKey = `${kind}|${profileId}`;
   const now = Date.now();
+  // Fast path: a profile id seen before maps straight to its entry, no credential resolution.
+  if (!opts?.force) {
+    const aliased = MODEL_CACHE_ALIAS.get(aliasKey);
+    const hit = aliased ? MODEL_CACHE.get(aliased) : undefined;
+    if (hit && now - hit.ts < MODEL_CACHE_TTL_MS) return hit.value;
+  }
+
+  const target = resolveModelsTarget(profileId, kind);
+  if ('error' in target) return { ok: false, models: [], message: target.error };
+
+  // Key entries on what is actually fetched (URL + credential), not on the profile id,
+  // so "default" and the explicit id of the same profile share one entry and one fetch.
+  const keyDigest = crypto.createHash('sha1').update(target.key).digest('hex');
+  const cacheKey = `${kind}|${target.url}|${keyDigest}`;
+  MODEL_CACHE_ALIAS.set(aliasKey, cacheKey);
   if (!opts?.force) {
     const hit = MODEL_CACHE.get(cacheKey);
     if (hit && now - hit.ts < MODEL_CACHE_TTL_MS) return hit.value;
   }
 
-  const result = await listModelsForProfileUncached(profileId, kind);
+  const result = await fetchModelList(target.url, target.key, kind);
   MODEL_CACHE.set(cacheKey, { ts: now, value: result });
   return result;
 }
 
-async function listModelsForProfileUncached(profileId: string, kind: ModelsKind): Promise<{ ok: boolean; models: string[]; message?: string }> {
+function resolveModelsTarget(profileId: string, kind: ModelsKind): { url: string; key: string } | { error: string } {
   try {
     const cred = resolveProfileCredentials(profileId);
-    if (!cred) return { ok: false, models: [], message: 'Profile not found.' };
-    if (!cred.ok) return { ok: false, models: [], message: cred.message || 'Profile is missing base_url/model/api_key.' };
+    if (!cred) return { error: 'Profile not found.' };
+    if (!cred.ok) return { error: cred.message || 'Profile is missing base_url/model/api_key.' };
 
     const provider = String(cred.provider || '').toLowerCase();
     const baseUrl = cred.baseUrl;
@@ -737,10 +811,17 @@ async function listModelsForProfileUncached(profileId: string, kind: ModelsKind)
     } else {
       url = buildOpenAIModelsUrl(baseUrl);
     }
+    return { url, key: cred.key };
+  } catch (e: any) {
+    return { error: e?.message || 'Failed to load models.' };
+  }
+}
 
+async function fetchModelList(url: string, key: string, kind: ModelsKind): Promise<{ ok: boolean; models: string[]; message?: string }> {
+  try {
     const json = await httpGetJson(url, {
-      Authorization: `Bearer ${cred.key}`,
-      'x-api-key': cred.key,
+      Authorization: `Bearer ${key}`,
+      'x-api-key': key,
     });
 
     let ids: string[] = [];
@@ -849,35 +930,32 @@ function sanitizeScopedDbFilename(v: string): string {
   return s.slice(0, 80);
 }
 
-let _loggedDefaultCategories = false;
-
 function mapSTProviderToMemU(provider: string): { provider: string; client_backend: string; provider_hint?: string } {
   const p = String(provider || '').trim().toLowerCase();
   // Treat common ST providers as OpenAI-compatible in local mode.
   // (memU local backends are wired for OpenAI-style base_url + api_key.)
-  const openaiCompat = new Set([
-    'openai',
-    'openai-compatible',
-    'openai_compatible',
-    'openrouter',
-    'nanogpt',
-    'groq',
-    'together',
-    'togetherai',
-    'mistral',
-    'deepseek',
-    'xai',
-    'perplexity',
-    'custom',
-    'vllm',
-    'lmstudio',
-    'ollama',
-  ]);
-  if (!p || openaiCompat.has(p)) return { provider: 'openai', client_backend: 'sdk' };
+  if (!p || OPENAI_COMPAT_PROVIDERS.has(p)) return { provider: 'openai', client_backend: 'sdk' };
   // Fallback: keep behavior stable but retain a hint for debugging.
   return { provider: 'openai', client_backend: 'sdk', provider_hint: p };
 }
 
+// One memU llm_profiles entry from resolved ST credentials.
+function toMemuLlmProfile(
+  cred: { provider: string; baseUrl: string; model: string; key: string },
+  embedModel?: string,
+): any {
+  const mapped = mapSTProviderToMemU(cred.provider);
+  return {
+    provider: mapped.provider,
+    base_url: cred.baseUrl,
+    api_key: cred.key,
+    chat_model: cred.model,
+    client_backend: mapped.client_backend,
+    ...(embedModel ? { embed_model: embedModel } : {}),
+    ...(mapped.provider_hint ? { provider_hint: mapped.provider_hint } : {}),
+  };
+}
+
 function buildMemuPayloadForLocal(
   cfg: MemuPluginConfig,
   userId: string,
@@ -887,7 +965,7 @@ function buildMemuPayloadForLocal(
 ): any {
 
   const step = (s: MemuStep): string => cfg.stepProfileId?.[s] || cfg.defaultProfileId || "default";
-  const steps: MemuStep[] = ["preprocess", "memory_extract", "category_update", "reflection", "ranking", "embeddings"];
+  const steps = MEMU_STEPS;
   const labelsById = new Map<string, string[]>();
   for (const s of steps) {
     const id = step(s);
@@ -895,8 +973,15 @@ function buildMemuPayloadForLocal(
     labels.push(s);
     labelsById.set(id, labels);
   }
+  // Default, per-step and embedding lookups often name the same profile; resolve
+  // each id once per payload (a "default" lookup re-scans the ST user dirs).
+  const resolvedById = new Map<string, ReturnType<typeof resolveProfileCredentials>>();
+  const resolveOnce = (id: string): ReturnType<typeof resolveProfileCredentials> => {
+    if (!resolvedById.has(id)) resolvedById.set(id, resolveProfileCredentials(id));
+    return resolvedById.get(id) ?? null;
+  };
   const resolveRequired = (id: string): NonNullable<ReturnType<typeof resolveProfileCredentials>> => {
-    const cred = resolveProfileCredentials(id);
+    const cred = resolveOnce(id);
     if (cred && cred.ok) return cred;
     const where = labelsById.get(id);
     const usedBy = where && where.length ? `steps=${where.join(",")}` : "step=unknown";
@@ -919,50 +1004,24 @@ function buildMemuPayloadForLocal(
   if (defaultReferencedBySteps) {
     defCred = resolveRequired(defId);
   } else {
-    const maybeDef = resolveProfileCredentials(defId);
+    const maybeDef = resolveOnce(defId);
     if (maybeDef && maybeDef.ok) defCred = maybeDef;
   }
-  if (defCred) {
-    const defMapped = mapSTProviderToMemU(defCred.provider);
-    llm_profiles["default"] = {
-      provider: defMapped.provider,
-      base_url: defCred.baseUrl,
-      api_key: defCred.key,
-      chat_model: defCred.model,
-      client_backend: defMapped.client_backend,
-      ...(defMapped.provider_hint ? { provider_hint: defMapped.provider_hint } : {}),
-    };
-  }
+  if (defCred) llm_profiles["default"] = toMemuLlmProfile(defCred);
 
   // Populate step-specific profiles
   for (const id of needIds) {
     const name = idToName(id);
     if (llm_profiles[name]) continue;
-    const cred = resolveRequired(id);
-    const mapped = mapSTProviderToMemU(cred.provider);
-    llm_profiles[name] = {
-      provider: mapped.provider,
-      base_url: cred.baseUrl,
-      api_key: cred.key,
-      chat_model: cred.model,
-      client_backend: mapped.client_backend,
-      ...(mapped.provider_hint ? { provider_hint: mapped.provider_hint } : {}),
-    };
+    llm_profiles[name] = toMemuLlmProfile(resolveRequired(id));
   }
 
   // Embeddings: memU pipelines default to embed_llm_profile="embedding" in many steps.
   const embedId = step("embeddings");
-  const embedCred = resolveRequired(embedId);
-  const embedMapped = mapSTProviderToMemU(embedCred.provider);
-  llm_profiles["embedding"] = {
-    provider: embedMapped.provider,
-    base_url: embedCred.baseUrl,
-    api_key: embedCred.key,
-    chat_model: embedCred.model,
-    client_backend: embedMapped.client_backend,
-    embed_model: (cfg as any).embeddingModel || "text-embedding-3-small",
-    ...(embedMapped.provider_hint ? { provider_hint: embedMapped.provider_hint } : {}),
-  };
+  llm_profiles["embedding"] = toMemuLlmProfile(
+    resolveRequired(embedId),
+    (cfg as any).embeddingModel || "text-embedding-3-small",
+  );
 
   // Keep a usable "default" profile even when global default is not referenced by steps.
   // This avoids failing on integrations that expect a default key to exist.
@@ -1031,19 +1090,15 @@ function getExternalServerBaseUrl(_cfg: MemuPluginConfig): string {
   // If the user provided a serverPath, prefer reading host/port from that server's config.json.
   try {
     const root = String((_cfg as any).serverPath || '').trim();
-    if (root) {
-      const cfgPath = path.join(root, 'config.json');
-      if (fs.existsSync(cfgPath)) {
-        const txt = fs.readFileSync(cfgPath, 'utf8');
-        const parsed: any = txt ? JSON.parse(txt) : null;
-        const listen: any = parsed && typeof parsed === 'object' ? (parsed as any).listen : null;
-        const hostRaw = listen && typeof listen.host === 'string' ? String(listen.host) : '';
-        const portRaw = listen && (typeof listen.port === 'number' || typeof listen.port === 'string') ? String(listen.port) : '';
-        const port = portRaw && /^\d+$/.test(portRaw) ? parseInt(portRaw, 10) : 0;
-        // If server binds to 0.0.0.0, the client should use loopback.
-        const host = hostRaw === '0.0.0.0' ? '127.0.0.1' : (hostRaw || '127.0.0.1');
-        if (port > 0) return `http://${host}:${port}`;
-      }
+    const parsed = root ? _readExternalServerConfig(root) : null;
+    if (parsed) {
+      const listen: any = (parsed as any).listen;
+      const hostRaw = listen && typeof listen.host === 'string' ? String(listen.host) : '';
+      const portRaw = listen && (typeof listen.port === 'number' || typeof listen.port === 'string') ? String(listen.port) : '';
+      const port = portRaw && /^\d+$/.test(portRaw) ? parseInt(portRaw, 10) : 0;
+      // If server binds to 0.0.0.0, the client should use loopback.
+      const host = hostRaw === '0.0.0.0' ? '127.0.0.1' : (hostRaw || '127.0.0.1');
+      if (port > 0) return `http://${host}:${port}`;
     }
   } catch {
     // ignore and fall back
@@ -1064,16 +1119,11 @@ function _expandTilde(pth: string): string {
   return pth.startsWith('~/') ? path.join(home, pth.slice(2)) : (pth === '~' ? home : pth);
 }
 
+// Shared by base URL, python and log file lookups so one status/request parses the
+// server config.json once (readJsonCached re-reads only when mtime changes).
 function _readExternalServerConfig(root: string): any | null {
-  try {
-    const cfgPath = path.join(root, 'config.json');
-    if (!fs.existsSync(cfgPath)) return null;
-    const txt = fs.readFileSync(cfgPath, 'utf8');
-    const parsed: any = txt ? JSON.parse(txt) : null;
-    return parsed && typeof parsed === 'object' ? parsed : null;
-  } catch {
-    return null;
-  }
+  const parsed: any = readJsonCached(path.join(root, 'config.json'));
+  return parsed && typeof parsed === 'object' ? parsed : null;
 }
 
 function getExternalServerPython(cfg: MemuPluginConfig): string {
@@ -1114,76 +1164,81 @@ function _getExternalLogFile(cfg: MemuPluginConfig): string | null {
 }
 
 function _readLogTail(logPath: string | null, maxLines: number): string[] {
+  if (!logPath) return [];
+  let fd: number | null = null;
   try {
-    if (!logPath) return [];
-    if (!fs.existsSync(logPath)) return [];
-    const stat = fs.statSync(logPath);
-    const size = stat && typeof stat.size === 'number' ? stat.size : 0;
+    // One open + fstat on the fd instead of separate exists/stat/open path lookups.
+    fd = fs.openSync(logPath, 'r');
+    const size = fs.fstatSync(fd).size || 0;
     if (!size) return [];
     const readBytes = Math.min(size, 64 * 1024);
-    const fd = fs.openSync(logPath, 'r');
-    const buf = Buffer.alloc(readBytes);
-    fs.readSync(fd, buf, 0, readBytes, size - readBytes);
-    fs.closeSync(fd);
-    const txt = buf.toString('utf8');
+    const buf = Buffer.allocUnsafe(readBytes);
+    const n = fs.readSync(fd, buf, 0, readBytes, size - readBytes);
+    const txt = buf.toString('utf8', 0, n);
     const lines = txt.split(/\r?\n/).filter((l) => l.trim().length > 0);
     return lines.slice(-Math.max(1, maxLines));
   } catch {
     return [];
+  } finally {
+    if (fd !== null) {
+      try { fs.closeSync(fd); } catch { /* ignore */ }
+    }
   }
 }
 
 function spawnExternalServer(pythonExe: string, runPyPath: string, cfg?: MemuPluginConfig): void {
-  let logStream: fs.WriteStream | null = null;
+  let logFd: number | null = null;
   let logPath: string | null = null;
 
+  const logWrite = (s: string): void => {
+    if (logFd === null) return;
+    try { fs.writeSync(logFd, s); } catch { /* ignore */ }
+  };
+  const logClose = (): void => {
+    if (logFd === null) return;
+    try { fs.closeSync(logFd); } catch { /* ignore */ }
+    logFd = null;
+  };
+
   try {
     logPath = cfg ? _getExternalLogFile(cfg) : null;
     if (logPath) {
       try { fs.mkdirSync(path.dirname(logPath), { recursive: true }); } catch { /* ignore */ }
-      try { logStream = fs.createWriteStream(logPath, { flags: 'a' }); } catch { logStream = null; }
-      try { logStream?.write(`\n--- start ${new Date().toISOString()} ---\n`); } catch { /* ignore */ }
+      try { logFd = fs.openSync(logPath, 'a'); } catch { logFd = null; }
+      logWrite(`\n--- start ${new Date().toISOString()} ---\n`);
     }
 
+    // Give the child the log file itself: its stdout/stderr go straight to disk
+    // instead of being relayed chunk by chunk through this process. If no log file
+    // could be resolved or opened, the server's output is discarded ('ignore').
+    // Keep terminal output concise (state, not a firehose).
+    const out = logFd !== null ? logFd : 'ignore';
     const child = spawn(pythonExe, [runPyPath], {
       cwd: path.dirname(runPyPath),
-      stdio: ['ignore', 'pipe', 'pipe'],
+      stdio: ['ignore', out, out],
       env: { ...process.env },
       detached: true,
     });
 
-    // Stream logs to file. Keep terminal output concise (state, not a firehose).
-    if (child && (child as any).stdout) {
-      try {
-        (child as any).stdout.on('data', (chunk: any) => {
-          try { logStream?.write(chunk); } catch { /* ignore */ }
-        });
-      } catch { /* ignore */ }
-    }
-    if (child && (child as any).stderr) {
-      try {
-        (child as any).stderr.on('data', (chunk: any) => {
-          try { logStream?.write(chunk); } catch { /* ignore */ }
-          // (stderr is still captured in the log file)
-        });
-      } catch { /* ignore */ }
-    }
-
     child.on('error', (e: any) => {
       const msg = e?.message ? String(e.message) : String(e);
       try { console.error(chalk.red(MODULE_NAME), 'Spawn failed:', msg); } catch { /* ignore */ }
-      try { logStream?.write(`\n[spawn error] ${msg}\n`); } catch { /* ignore */ }
+      logWrite(`\n[spawn error] ${msg}\n`);
+      logClose();
     });
+    // The child holds its own copy of the fd; ours is only needed for our markers.
+    child.on('spawn', logClose);
 
     child.unref();
     const childPid = (child && typeof (child as any).pid === 'number') ? (child as any).pid : null;
 
     try { console.log(chalk.gray(MODULE_NAME), `pid=${childPid || 'unknown'}`); } catch { /* ignore */ }
-    try { logStream?.write(`[spawned pid=${childPid || 'unknown'}]\n`); } catch { /* ignore */ }
+    logWrite(`[spawned pid=${childPid || 'unknown'}]\n`);
   } catch (e: any) {
     const msg = e?.message ? String(e.message) : String(e);
     try { console.error(chalk.red(MODULE_NAME), 'Spawn failed:', msg); } catch { /* ignore */ }
-    try { logStream?.write(`\n[spawn error] ${msg}\n`); } catch { /* ignore */ }
+    logWrite(`\n[spawn error] ${msg}\n`);
+    logClose();
   }
 }
 
@@ -1213,14 +1268,34 @@ async function isServerHealthy(baseUrl: string): Promise<boolean> {
   }
 }
 
-async function ensureLocalServer(
+type LocalServerEndpoint = { baseUrl: string; host: string; port: number };
+
+// One in-flight ensure per (server, may-start) key: concurrent requests that find the
+// server down share a single probe/spawn/wait cycle instead of each polling /health.
+const _ensureServerInflight = new Map<string, Promise<LocalServerEndpoint>>();
+
+function ensureLocalServer(
   cfg: MemuPluginConfig,
   opts: { forceStart?: boolean } = {},
-): Promise<{ baseUrl: string; host: string; port: number }> {
-  // External server (mcp-memu-server). No Python probing required here.
+): Promise<LocalServerEndpoint> {
   const baseUrl = getExternalServerBaseUrl(cfg);
-  const autoStartServer = cfg.autoStartServer !== false;
-  const shouldStartIfDown = autoStartServer || opts.forceStart === true;
+  const shouldStartIfDown = cfg.autoStartServer !== false || opts.forceStart === true;
+  const key = `${baseUrl}|${shouldStartIfDown ? 'start' : 'nostart'}`;
+  let pending = _ensureServerInflight.get(key);
+  if (!pending) {
+    pending = _ensureLocalServerOnce(cfg, baseUrl, shouldStartIfDown)
+      .finally(() => _ensureServerInflight.delete(key));
+    _ensureServerInflight.set(key, pending);
+  }
+  return pending;
+}
+
+async function _ensureLocalServerOnce(
+  cfg: MemuPluginConfig,
+  baseUrl: string,
+  shouldStartIfDown: boolean,
+): Promise<LocalServerEndpoint> {
+  // External server (mcp-memu-server). No Python probing required here.
   const okNow = await isServerHealthy(baseUrl);
 
   if (!okNow) {
@@ -1483,6 +1558,17 @@ function setTask(taskId: string, patch: Partial<{ status: LocalTaskStatus; updat
   pruneLocalTasks();
 }
 
+// In-flight memorize tasks, keyed cheaply by scope, Model Mapping and conversation
+// shape. A resubmission that matches the key is hashed (and the original lazily) to
+// confirm identical content before it joins the running task; normal submissions
+// never pay for a serialize + hash. Entries leave when the task ends.
+type MemorizeInflight = { taskId: string; conversation: any[]; digest?: string };
+const memorizeInflight = new Map<string, MemorizeInflight>();
+
+function conversationDigest(conversation: any[]): string {
+  return crypto.createHash('sha1').update(JSON.stringify(conversation)).digest('hex');
+}
+
 function applyTimeZoneHints(payload: any, timeZone: string, timeZoneOffsetMin: number | undefined): void {
   if (timeZone) payload.timeZone = timeZone;
   if (timeZoneOffsetMin !== undefined) payload.timeZoneOffsetMin = timeZoneOffsetMin;
@@ -1512,20 +1598,52 @@ export async function proxyMemorizeConversation(req: Request, res: Response): Pr
 
   pruneLocalTasks();
 
+  let inflightKey: string | null = null;
+  if (!force) {
+    const keyCfg = readPluginConfig();
+    const last = conversation[conversation.length - 1];
+    const lastLen = last && typeof last.content === "string" ? last.content.length : -1;
+    inflightKey = JSON.stringify([
+      userId, characterId, characterName, userName, soulName, chatFileName, conversationId,
+      timeZone, timeZoneOffsetMin ?? null,
+      keyCfg.defaultProfileId, keyCfg.stepProfileId, (keyCfg as any).embeddingModel ?? null,
+      conversation.length, lastLen,
+    ]);
+    const prev = memorizeInflight.get(inflightKey);
+    const prevTask = prev ? localTasks.get(prev.taskId) : undefined;
+    if (prev && prevTask && (prevTask.status === "PENDING" || prevTask.status === "PROCESSING")) {
+      if (!prev.digest) prev.digest = conversationDigest(prev.conversation);
+      if (prev.digest === conversationDigest(conversation)) {
+        // joined: this taskId belongs to the still-running first submission; the
+        // extension polls it via getTaskStatus exactly like a fresh taskId.
+        res.json({ taskId: prev.taskId, joined: true });
+        return;
+      }
+    }
+  }
+
   const taskId = makeTaskId();
   localTasks.set(taskId, { status: "PENDING", createdAt: Date.now(), updatedAt: Date.now() });
+  if (inflightKey) memorizeInflight.set(inflightKey, { taskId, conversation });
 
   // Fire and forget
   void (async () => {
     try {
       setTask(taskId, { status: "PROCESSING" });
       const cfg = readPluginConfig();
-      const namedConversation = conversation.map((msg: any) => {
-        if (!msg || typeof msg !== "object") return msg;
-        if (msg.role === "user" && userName) return { ...msg, name: userName };
-        if (msg.role === "assistant" && soulName) return { ...msg, name: soulName };
-        return msg;
-      });
+      // Only copy messages whose name actually changes; when every message already
+      // carries its name the original array is reused as-is.
+      const nameFor = (msg: any): string => {
+        if (!msg || typeof msg !== "object") return "";
+        const name = msg.role === "user" ? userName : (msg.role === "assistant" ? soulName : "");
+        return name && msg.name !== name ? name : "";
+      };
+      const namedConversation = conversation.some((msg: any) => !!nameFor(msg))
+        ? conversation.map((msg: any) => {
+          const name = nameFor(msg);
+          return name ? { ...msg, name } : msg;
+        })
+        : conversation;
       const srv = await ensureLocalServer(cfg);
       const payload = buildMemuPayloadForLocal(cfg, userId, characterId, namedConversation, {
         characterName,
@@ -1537,6 +1655,8 @@ export async function proxyMemorizeConversation(req: Request, res: Response): Pr
       setTask(taskId, { status: 'SUCCESS' });
     } catch (e: any) {
       setTask(taskId, { status: "FAILURE", error: e?.message || String(e) });
+    } finally {
+      if (inflightKey && memorizeInflight.get(inflightKey)?.taskId === taskId) memorizeInflight.delete(inflightKey);
     }
   })();
 
@@ -1598,10 +1718,7 @@ export async function proxyRetrieveDefaultCategories(req: Request, res: Response
     out.push({ ...c, name: nm, summary });
   }
 
-  if (!_loggedDefaultCategories) {
-    console.log(chalk.gray(MODULE_NAME), 'retrieveDefaultCategories: stored=', out.length, 'backend=server');
-    _loggedDefaultCategories = true;
-  }
+  debugLog('retrieveDefaultCategories: stored=', out.length, 'backend=server');
 
   res.json({ categories: out });
 }